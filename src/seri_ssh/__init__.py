@@ -3,8 +3,27 @@
 Provides a small logging configuration helper for the package.
 """
 import logging
+import time
 from typing import Optional
 
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class _CachedTimeFormatter(logging.Formatter):
+	"""Formatter that runs strftime at most once per second of log time."""
+
+	def __init__(self, fmt: Optional[str] = None) -> None:
+		super().__init__(fmt)
+		self._cached_sec: Optional[int] = None
+		self._cached_time = ""
+
+	def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+		sec = int(record.created)
+		if sec != self._cached_sec:
+			self._cached_time = time.strftime(self.default_time_format, self.converter(sec))
+			self._cached_sec = sec
+		return self.default_msec_format % (self._cached_time, record.msecs)
+
 
 def configure_logging(level: str = "INFO", logfile: Optional[str] = None) -> None:
 	"""Configure basic logging for the package.
@@ -19,7 +38,9 @@ def configure_logging(level: str = "INFO", logfile: Optional[str] = None) -> Non
 		handlers.append(logging.FileHandler(logfile))
 	else:
 		handlers.append(logging.StreamHandler())
-	logging.basicConfig(level=lvl, format="%(asctime)s %(levelname)s %(name)s: %(message)s", handlers=handlers)
+	for handler in handlers:
+		handler.setFormatter(_CachedTimeFormatter(LOG_FORMAT))
+	logging.basicConfig(level=lvl, handlers=handlers)
 	
 	# Also set asyncssh logger to the same level for debugging
 	asyncssh_logger = logging.getLogger("asyncssh")
@@ -1,32 +1,37 @@
 import argparse
 import asyncio
+import multiprocessing
 import os
 import pathlib
+import signal
 import sys
 from . import server, configure_logging, logger
 
 
 def ensure_host_key(path: str):
+    # Blocking (keygen + file I/O): run via loop.run_in_executor
     p = pathlib.Path(path)
     if not p.exists():
-        # generate a simple key using asyncssh (if available at runtime)
-        try:
-            import asyncssh
-            key = asyncssh.generate_private_key('ssh-rsa')
-            p.write_text(key.export_private_key())
-        except Exception:
-            # fallback: create an empty file and let asyncssh error later
-            p.write_text('')
+        # Ed25519: keygen is near-instant and handshakes are cheaper than RSA
+        import asyncssh
+        key = asyncssh.generate_private_key('ssh-ed25519')
+        fd = os.open(p, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key.export_private_key())
+        logger.info("Generated new host key: %s", path)
 
 
 def main():
     ap = argparse.ArgumentParser(description='seri-ssh - SSH to PTY bridge')
-    ap.add_argument('--host-key', default='host_key', help='Path to host private key')
+    ap.add_argument('--host-key', default='host_key', help='Path to host private key (an Ed25519 key is generated if missing)')
     ap.add_argument('--port', type=int, default=2222, help='Port to listen on')
     ap.add_argument('--user', help='Allowed username for password auth')
     ap.add_argument('--password', help='Password for the allowed user')
     ap.add_argument('--serial', help='Serial device path to bridge (e.g. /dev/ttyUSB0). If omitted a PTY pair is created and the slave path is shown in logs')
     ap.add_argument('--baud', type=int, default=115200, help='Serial baud rate (used when --serial is provided)')
+    ap.add_argument('--flush-delay', type=float, default=server.FLUSH_DELAY * 1000, help='Milliseconds to batch serial output before sending it over SSH; 0 sends at the end of each event-loop iteration (default: %(default)g)')
+    ap.add_argument('--workers', type=int, default=1, help='Number of server processes sharing the port via SO_REUSEPORT; the serial port serves one session at a time across all workers (default: 1)')
+    ap.add_argument('--no-uvloop', action='store_true', help='Use the default asyncio event loop even if uvloop is installed')
     ap.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], help='Logging level (default: INFO)')
 
     args = ap.parse_args()
@@ -40,23 +45,93 @@ def main():
 
     logger.info("seri_ssh starting: port=%s serial=%s baud=%s", args.port, args.serial, args.baud)
 
-    # Require an existing host key file; fail fast if missing
-    if not pathlib.Path(args.host_key).exists():
-        logger.error("Host key not found: %s", args.host_key)
-        sys.exit(1)
-
     # Require a serial device path to be provided
     if not args.serial:
         logger.error("Serial device path is required (--serial)")
         sys.exit(1)
 
+    if args.workers < 1:
+        logger.error("--workers must be at least 1")
+        sys.exit(1)
+
+    if args.workers == 1:
+        _serve(args)
+        return
+
+    # Generate the host key before forking so workers don't race to create it
+    try:
+        ensure_host_key(args.host_key)
+    except Exception:
+        logger.exception("Host key not available: %s", args.host_key)
+        sys.exit(1)
+
+    # Each worker listens on the same port (SO_REUSEPORT); the kernel spreads
+    # incoming connections across them
+    # daemon=True: workers are also terminated if the parent exits early
+    workers = [multiprocessing.Process(target=_serve, args=(args,), name='seri_ssh-worker-%d' % i, daemon=True) for i in range(args.workers)]
+    for w in workers:
+        w.start()
+    logger.info("Started %d worker processes", len(workers))
+    # Installed after forking so workers keep the default SIGTERM behaviour
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    try:
+        for w in workers:
+            w.join()
+    except KeyboardInterrupt:
+        logger.info("Interrupted, shutting down")
+    except SystemExit:
+        logger.info("Terminated, shutting down")
+    finally:
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+        for w in workers:
+            w.join()
+
+
+def _on_sigterm(signum, frame):
+    # Unwind the parent's join loop so the workers get stopped
+    raise SystemExit(0)
+
+
+def _serve(args):
+    # Runs one server instance; in --workers mode this is a child process
+    configure_logging(level=args.log_level)
+    reuse_port = args.workers > 1
+
     async def _run_server():
-        await server.start_server(host='0.0.0.0', port=args.port, host_key=args.host_key, user=args.user, password=args.password, serial_path=args.serial, baudrate=args.baud)
+        # Generate the host key if missing, off the event loop
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, ensure_host_key, args.host_key)
+        except Exception:
+            logger.exception("Host key not available: %s", args.host_key)
+            sys.exit(1)
+        try:
+            await server.start_server(host='0.0.0.0', port=args.port, host_key=args.host_key, user=args.user, password=args.password, serial_path=args.serial, baudrate=args.baud, flush_delay=args.flush_delay / 1000, reuse_port=reuse_port)
+        except Exception:
+            logger.exception("Failed to start server")
+            sys.exit(1)
         # keep running until interrupted
         await asyncio.Future()
 
+    # Prefer uvloop's event loop when available (faster per-event dispatch)
+    run_kwargs = {}
+    if not args.no_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            logger.debug("uvloop not available, using default asyncio event loop")
+        else:
+            if sys.version_info >= (3, 12):
+                # uvloop.install() is deprecated on 3.12+
+                run_kwargs['loop_factory'] = uvloop.new_event_loop
+            else:
+                uvloop.install()
+            logger.debug("Using uvloop event loop")
+
     try:
-        asyncio.run(_run_server())
+        asyncio.run(_run_server(), **run_kwargs)
     except KeyboardInterrupt:
         logger.info("Interrupted, shutting down")
 
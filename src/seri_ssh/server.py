@@ -5,10 +5,24 @@ import termios
 import struct
 import logging
 import asyncssh
-import serial
 
 logger = logging.getLogger("seri_ssh.server")
 
+# Output batching: flush PTY/serial data to SSH after FLUSH_DELAY seconds,
+# or immediately once FLUSH_THRESHOLD bytes have accumulated. A delay of 0
+# only coalesces reads within the same event-loop iteration (no added latency).
+FLUSH_DELAY = 0.008
+FLUSH_THRESHOLD = 16 * 1024
+# Maximum number of bytes read from SSH stdin per read call
+READ_SIZE = 64 * 1024
+# Serial reopen backoff (seconds) when the device disappears mid-session
+REOPEN_MIN_DELAY = 0.5
+REOPEN_MAX_DELAY = 30.0
+# SSH channel write-buffer limits: PTY/serial reads are paused above the high
+# mark and resumed once the channel has drained below the low mark
+WRITE_HIGH_WATER = 256 * 1024
+WRITE_LOW_WATER = 64 * 1024
+
 
 def set_pty_size(fd, cols, rows):
     # TIOCSWINSZ
@@ -16,36 +30,239 @@ def set_pty_size(fd, cols, rows):
     fcntl.ioctl(fd, termios.TIOCSWINSZ, winsize)
 
 
+class SerialDevice:
+    """Serial port opened once in start_server, used by one session at a time.
+
+    The port is a raw, non-blocking tty fd configured with termios (8N1, no
+    flow control), so it goes through the same read/write path as the PTY.
+    """
+
+    def __init__(self, path, baudrate):
+        self.path = path
+        self.baudrate = baudrate
+        self.fd = None
+        self._reopen_task = None
+        self._session = None
+        # One read transport per device, feeding the attached session
+        self._transport = None
+        self._connect_task = None
+        self._paused = False
+
+    def acquire(self, session):
+        """Claim the port exclusively for a session.
+
+        The same policy applies in and across processes: a second session in
+        this process is refused, and an advisory flock refuses sessions in
+        other --workers processes (each with its own open of the device).
+        Returns False if the port is already in use.
+        """
+        if self._session is not None:
+            return False
+        # While the device is being reopened, _reopen() takes the lock instead
+        if self.fd is not None and not self._lock(self.fd):
+            return False
+        self._session = session
+        return True
+
+    def release(self, session):
+        if self._session is not session:
+            return
+        self._session = None
+        self._paused = False
+        self.stop_reader()
+        if self.fd is not None:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            except Exception:
+                logger.exception("Error unlocking serial port")
+
+    def _lock(self, fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def open(self):
+        fd = self._open()
+        logger.info('Opened serial %s baud=%s (8N1, no flow control)', self.path, self.baudrate)
+        self.fd = fd
+        return fd
+
+    def _open(self):
+        # Runs in an executor thread during reopen, so it only configures and
+        # returns the fd; self.fd and the lock are set on the loop thread
+        speed = getattr(termios, 'B%d' % self.baudrate, None)
+        if speed is None:
+            raise ValueError('Unsupported baud rate: %s' % self.baudrate)
+        fd = os.open(self.path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            iflag, oflag, cflag, lflag, ispeed, ospeed, cc = termios.tcgetattr(fd)
+            # Raw mode (cfmakeraw), 8N1, no software/hardware flow control
+            iflag &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK | termios.ISTRIP
+                       | termios.INLCR | termios.IGNCR | termios.ICRNL
+                       | termios.IXON | termios.IXOFF | termios.IXANY)
+            oflag &= ~termios.OPOST
+            lflag &= ~(termios.ECHO | termios.ECHONL | termios.ICANON | termios.ISIG | termios.IEXTEN)
+            cflag &= ~(termios.CSIZE | termios.PARENB | termios.CSTOPB | getattr(termios, 'CRTSCTS', 0))
+            cflag |= termios.CS8 | termios.CLOCAL | termios.CREAD
+            cc[termios.VMIN] = 1
+            cc[termios.VTIME] = 0
+            termios.tcsetattr(fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, speed, speed, cc])
+        except Exception:
+            os.close(fd)
+            raise
+        return fd
+
+    def close(self):
+        if self.fd is not None:
+            try:
+                os.close(self.fd)
+                logger.info("Closed serial port")
+            except Exception:
+                logger.exception("Error closing serial port")
+            self.fd = None
+
+    def start_reader(self):
+        if self.fd is None or self._transport is not None or self._connect_task is not None:
+            return
+        self._connect_task = asyncio.get_running_loop().create_task(self._connect_reader())
+
+    def stop_reader(self):
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            self._connect_task = None
+        if self._transport is not None:
+            # Unregisters the fd from the loop immediately
+            transport, self._transport = self._transport, None
+            transport.close()
+
+    async def _connect_reader(self):
+        # The transport gets its own descriptor: closing the transport closes
+        # it (uvloop does so even with closefd=False), while self.fd stays
+        # open for writes and the flock until close()
+        pipe = os.fdopen(os.dup(self.fd), 'rb', buffering=0)
+        try:
+            self._transport, _ = await asyncio.get_running_loop().connect_read_pipe(lambda: _ReadPipeProtocol(self), pipe)
+            if self._paused:
+                self._transport.pause_reading()
+            logger.debug("Connected read pipe for serial %s (fd=%s)", self.path, pipe.fileno())
+        except asyncio.CancelledError:
+            pipe.close()
+            raise
+        except Exception:
+            pipe.close()
+            logger.exception("Failed to connect read pipe for serial %s", self.path)
+        finally:
+            self._connect_task = None
+
+    def pause_reading(self):
+        self._paused = True
+        if self._transport is not None:
+            self._transport.pause_reading()
+
+    def resume_reading(self):
+        self._paused = False
+        if self._transport is not None:
+            self._transport.resume_reading()
+
+    def _buffer_output(self, data):
+        if self._session is not None:
+            self._session._buffer_output(data)
+
+    def _on_read_closed(self, transport, exc):
+        if transport is not self._transport:
+            # Closed by stop_reader
+            return
+        self._transport = None
+        if exc is not None:
+            logger.info("Read pipe for serial %s closed with error: %r", self.path, exc)
+        logger.warning("Serial port %s lost; reopening", self.path)
+        if self._session is not None:
+            # Before close(): the session must drop its pending writes on the fd
+            self._session._on_serial_lost()
+        self.reopen()
+
+    def reopen(self):
+        """Reopen the port with exponential backoff.
+
+        Returns a future shared by all callers, so concurrent callers wait on
+        a single reopen attempt. The attached session (if any) is told when
+        the port is back; sessions always write through ``self.fd``, which is
+        None while the port is closed.
+        """
+        if self._reopen_task is None or self._reopen_task.done():
+            self._reopen_task = asyncio.ensure_future(self._reopen())
+        return self._reopen_task
+
+    async def _reopen(self):
+        self.stop_reader()
+        self.close()
+        loop = asyncio.get_running_loop()
+        delay = REOPEN_MIN_DELAY
+        while True:
+            try:
+                fd = await loop.run_in_executor(None, self._open)
+            except Exception as e:
+                logger.warning("Could not reopen serial port %s (%s); retrying in %.1fs", self.path, e, delay)
+            else:
+                if self._session is None or self._lock(fd):
+                    break
+                # Reopened for an attached session, but another worker took
+                # the port meanwhile
+                os.close(fd)
+                logger.warning("Serial port %s is locked by another process; retrying in %.1fs", self.path, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, REOPEN_MAX_DELAY)
+        logger.info('Opened serial %s baud=%s (8N1, no flow control)', self.path, self.baudrate)
+        self.fd = fd
+        if self._session is not None:
+            self.start_reader()
+            self._session._on_serial_reattached()
+        return fd
+
+
 class PTYBridgeSession(asyncssh.SSHServerSession):
-    def __init__(self, master_fd, slave_name, serial_port=None):
-        logger.debug("PTYBridgeSession.__init__: master_fd=%s, slave_name=%s, serial_port=%s", master_fd, slave_name, serial_port is not None)
+    def __init__(self, master_fd, slave_name, serial_device=None, flush_delay=FLUSH_DELAY):
+        logger.debug("PTYBridgeSession.__init__: master_fd=%s, slave_name=%s, serial_device=%s", master_fd, slave_name, serial_device is not None)
         self._chan = None
         self._master_fd = master_fd
         self._slave_name = slave_name
-        self._serial_port = serial_port
-        self._loop = asyncio.get_event_loop()
+        self._serial_device = serial_device
+        # PTY master fd used for reads/writes. The serial fd is not cached:
+        # it changes when SerialDevice reopens the port, so it is read from
+        # the device on every write.
+        self._reader_fd = master_fd if serial_device is None else None
+        # Bound in connection_made to the loop that dispatches the callbacks
+        self._loop = None
+        # Checked once so hot-path debug calls don't slice/format data when DEBUG is off
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        self._out_buf = bytearray()
+        self._read_transport = None
+        self._read_connect_task = None
+        self._flush_handle = None
+        self._flush_delay = flush_delay
+        self._write_buf = bytearray()
+        self._write_fd = None
+        self._read_paused = False
+        self._drain_task = None
+        self._closed = False
 
     def connection_made(self, chan):
         logger.debug("connection_made() called with chan=%s", chan)
         self._chan = chan
-        # Start reader for master_fd or serial_port
-        reader_fd = self._master_fd
-        if self._serial_port is not None:
-            try:
-                reader_fd = self._serial_port.fileno()
-                logger.debug("Got fileno() from serial_port: %s", reader_fd)
-            except Exception:
-                logger.exception("Failed to get fileno() from serial_port")
-                reader_fd = None
-        
-        logger.debug("connection_made: reader_fd=%s, master_fd=%s, serial_port=%s", reader_fd, self._master_fd, self._serial_port)
-        
-        if reader_fd is not None:
-            try:
-                self._loop.add_reader(reader_fd, self._on_master_readable)
-                logger.info("SSH channel opened for PTY slave=%s (fd=%s)", self._slave_name, reader_fd)
-            except Exception:
-                logger.exception("Failed to add_reader for fd=%s", reader_fd)
+        self._loop = asyncio.get_running_loop()
+        # Flow control: asyncssh pauses the channel writer at the same high mark
+        # that _check_write_buffer pauses the reader at
+        try:
+            getattr(chan, 'channel', chan).set_write_buffer_limits(high=WRITE_HIGH_WATER, low=WRITE_LOW_WATER)
+        except AttributeError:
+            pass
+        # Start reader for the serial port (owned by the device) / master_fd
+        if self._serial_device is not None:
+            self._serial_device.start_reader()
+        elif self._reader_fd is not None:
+            self._read_connect_task = self._loop.create_task(self._connect_reader())
         else:
             logger.warning("Could not register reader for slave=%s", self._slave_name)
 
@@ -54,14 +271,14 @@ class PTYBridgeSession(asyncssh.SSHServerSession):
 
     def pty_received(self, term, width, height, pixwidth, pixheight, modes):
         # Only set PTY size if using PTY, not serial port
-        if self._master_fd is not None and self._serial_port is None:
+        if self._master_fd is not None and self._serial_device is None:
             try:
                 set_pty_size(self._master_fd, width, height)
                 logger.debug("Set PTY size: %dx%d", width, height)
             except Exception:
                 logger.exception("Failed to set pty size")
         else:
-            logger.debug("Skipping PTY size setting (serial_port=%s)", self._serial_port)
+            logger.debug("Skipping PTY size setting (serial=%s)", self._slave_name)
 
     def shell_requested(self):
         return True
@@ -71,83 +288,252 @@ class PTYBridgeSession(asyncssh.SSHServerSession):
         return False
 
     def data_received(self, data, datatype):
-        logger.debug("data_received: len=%d, serial_port=%s, data=%r", len(data), self._serial_port is not None, data[:50])
-        if self._serial_port is not None:
-            # PySerialを使用している場合
+        if self._debug:
+            logger.debug("data_received: len=%d, serial=%s, data=%r", len(data), self._serial_device is not None, data[:50])
+        if self._closed:
+            return
+        if self._serial_device is not None:
+            # シリアルポートを使用している場合
+            # Non-blocking write, no tcdrain(): waiting for the UART to empty
+            # would stall the event loop.
+            fd = self._serial_device.fd
+            if fd is None:
+                # Being reopened; input is dropped meanwhile
+                return
             try:
-                bytes_data = data.encode() if isinstance(data, str) else data
-                bytes_written = self._serial_port.write(bytes_data)
-                logger.debug("Wrote %d bytes to serial port (requested %d bytes)", bytes_written, len(bytes_data))
-                self._serial_port.flush()
-                logger.debug("Flushed serial port buffer")
+                self._write_nonblocking(fd, data)
             except Exception:
                 logger.exception("Failed to write to serial port")
-        elif self._master_fd is not None:
+        elif self._reader_fd is not None:
             # PTY/PTSを使用している場合
             try:
-                os.write(self._master_fd, data.encode() if isinstance(data, str) else data)
-                logger.debug("Wrote data to PTY")
+                self._write_nonblocking(self._reader_fd, data)
             except Exception:
                 logger.exception("Failed to write to PTY")
 
-    def _on_master_readable(self):
-        logger.debug("_on_master_readable called")
+    def _write_nonblocking(self, fd, data):
+        if self._write_buf:
+            # Already backlogged; keep byte order by appending behind it
+            self._write_buf += data
+            return
         try:
-            if self._serial_port is not None:
-                # PySerialの非ブロッキング読み込み
-                in_waiting = self._serial_port.in_waiting
-                logger.debug("Serial port in_waiting=%s", in_waiting)
-                if in_waiting > 0:
-                    data = self._serial_port.read(1024)
-                    logger.debug("Read %d bytes from serial port: %r", len(data), data[:50])
-                else:
-                    data = b""
-            else:
-                # PTYの読み込み
-                data = os.read(self._master_fd, 1024)
-                if data:
-                    logger.debug("Read %d bytes from PTY: %r", len(data), data[:50])
-        except (OSError, Exception) as e:
-            logger.exception("Error reading from source: %s", e)
-            data = b""
-        
-        if data:
+            n = os.write(fd, data)
+        except BlockingIOError:
+            n = 0
+        if self._debug:
+            logger.debug("Wrote %d bytes to fd=%s (requested %d bytes)", n, fd, len(data))
+        if n < len(data):
+            self._write_buf += data[n:]
+            self._write_fd = fd
+            self._loop.add_writer(fd, self._on_writable)
+
+    def _on_writable(self):
+        try:
+            n = os.write(self._write_fd, self._write_buf)
+        except BlockingIOError:
+            return
+        except Exception:
+            logger.exception("Failed to write to fd=%s", self._write_fd)
+            self._cancel_write()
+            return
+        del self._write_buf[:n]
+        if not self._write_buf:
+            self._cancel_write()
+
+    def _cancel_write(self):
+        if self._write_fd is not None:
             try:
-                # Decode bytes to str for asyncssh SSHWriter
-                text_data = data.decode('utf-8', errors='replace')
-                self._chan.write(text_data)
-                logger.debug("Wrote %d chars to SSH channel", len(text_data))
+                self._loop.remove_writer(self._write_fd)
             except Exception:
-                logger.exception("Failed to write to channel")
-        else:
-            # EOF or no data
-            logger.debug("No data available, not sending EOF")
+                logger.exception("Error removing writer for fd %s", self._write_fd)
+            self._write_fd = None
+        self._write_buf.clear()
 
-    def eof_received(self):
+    async def _connect_reader(self):
+        # The read pipe transport handles readiness, buffering and
+        # pause/resume for the PTY master; data lands in _buffer_output.
+        # It reads from a dup of master_fd, which it closes itself (uvloop
+        # does so regardless of closefd); _close_device closes the original.
+        # The serial port's reader belongs to SerialDevice.
+        pipe = os.fdopen(os.dup(self._reader_fd), 'rb', buffering=0)
         try:
-            if self._serial_port is not None:
-                self._serial_port.close()
+            self._read_transport, _ = await self._loop.connect_read_pipe(lambda: _ReadPipeProtocol(self), pipe)
+            if self._read_paused:
+                self._read_transport.pause_reading()
+            logger.info("SSH channel opened for slave=%s (fd=%s)", self._slave_name, self._reader_fd)
+        except asyncio.CancelledError:
+            pipe.close()
+            raise
+        except Exception:
+            pipe.close()
+            logger.exception("Failed to connect read pipe for fd=%s", self._reader_fd)
+        finally:
+            self._read_connect_task = None
+
+    def _on_read_closed(self, transport, exc):
+        if transport is not self._read_transport:
+            # Closed by _stop_reader
+            return
+        self._read_transport = None
+        if exc is not None:
+            logger.info("Read pipe for slave=%s closed with error: %r", self._slave_name, exc)
+
+    def _on_serial_lost(self):
+        # Called by SerialDevice before it closes the fd. The SSH session is
+        # kept alive while the device reopens the port.
+        if self._closed:
+            return
+        self._cancel_write()
+        self._notify("serial device %s lost, reconnecting..." % self._slave_name)
+
+    def _on_serial_reattached(self):
+        if self._closed:
+            return
+        logger.info("Serial port %s reattached", self._slave_name)
+        self._notify("serial device %s reconnected" % self._slave_name)
+
+    def _notify(self, text):
+        # Status line for the SSH client, kept apart from device output
+        self._flush()
+        line = "\r\n[seri_ssh] %s\r\n" % text
+        try:
+            self._chan.write(line.encode())
+        except Exception:
+            logger.exception("Failed to write to channel")
+
+    def _buffer_output(self, data):
+        if self._closed:
+            # Session already torn down (late delivery from a reader)
+            return
+        self._out_buf += data
+        if len(self._out_buf) >= FLUSH_THRESHOLD:
+            self._flush()
+        elif self._flush_handle is None:
+            if self._flush_delay > 0:
+                self._flush_handle = self._loop.call_later(self._flush_delay, self._flush)
             else:
-                os.close(self._master_fd)
+                self._flush_handle = self._loop.call_soon(self._flush)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._out_buf:
+            return
+        # Hand the accumulator itself to the channel and start a fresh one,
+        # instead of copying it into a bytes object first
+        data = self._out_buf
+        self._out_buf = bytearray()
+        try:
+            # Binary channel: bytes pass through as-is
+            self._chan.write(data)
+            if self._debug:
+                logger.debug("Wrote %d bytes to SSH channel", len(data))
         except Exception:
-            logger.exception("Error closing master fd on EOF")
-        return True
+            logger.exception("Failed to write to channel")
+            return
+        self._check_write_buffer()
 
-    def connection_lost(self, exc):
-        # Remove reader
-        reader_fd = self._master_fd
-        if self._serial_port is not None:
-            try:
-                reader_fd = self._serial_port.fileno()
-            except Exception:
-                logger.exception("Failed to get fileno() from serial_port")
-                reader_fd = None
-        
-        if reader_fd is not None:
+    def _check_write_buffer(self):
+        # Stop reading the PTY/serial port while the client is slower than
+        # the device, so asyncssh's send buffer cannot grow without bound
+        if self._read_paused:
+            return
+        try:
+            size = getattr(self._chan, 'channel', self._chan).get_write_buffer_size()
+        except AttributeError:
+            return
+        if size <= WRITE_HIGH_WATER:
+            return
+        self._pause_reading()
+        if hasattr(self._chan, 'drain'):
+            # Stream writer (session_factory): resume once drain() returns.
+            # A plain channel calls resume_writing() instead.
+            self._drain_task = self._loop.create_task(self._wait_drain())
+
+    async def _wait_drain(self):
+        try:
+            await self._chan.drain()
+        except Exception:
+            # Channel closed; connection_lost does the cleanup
+            return
+        finally:
+            self._drain_task = None
+        self._resume_reading()
+
+    def pause_writing(self):
+        self._pause_reading()
+
+    def resume_writing(self):
+        self._resume_reading()
+
+    def _pause_reading(self):
+        if self._read_paused or self._closed:
+            return
+        self._read_paused = True
+        if self._debug:
+            logger.debug("Pausing reads from slave=%s (SSH write buffer full)", self._slave_name)
+        if self._serial_device is not None:
+            self._serial_device.pause_reading()
+        elif self._read_transport is not None:
+            self._read_transport.pause_reading()
+
+    def _resume_reading(self):
+        if not self._read_paused or self._closed:
+            return
+        self._read_paused = False
+        if self._debug:
+            logger.debug("Resuming reads from slave=%s", self._slave_name)
+        if self._serial_device is not None:
+            self._serial_device.resume_reading()
+        elif self._read_transport is not None:
+            self._read_transport.resume_reading()
+
+    def _cancel_flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._out_buf.clear()
+
+    def _stop_reader(self):
+        if self._read_connect_task is not None:
+            self._read_connect_task.cancel()
+            self._read_connect_task = None
+        if self._read_transport is not None:
+            # Unregisters the fd from the loop immediately
+            transport, self._read_transport = self._read_transport, None
+            transport.close()
+            logger.debug("Closed read pipe for fd=%s", self._reader_fd)
+        # Invalidate so a late callback cannot read from a closed fd
+        self._reader_fd = None
+
+    def _close_device(self):
+        self._closed = True
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        # Reader must be removed before the fd is closed
+        self._stop_reader()
+        # The serial port is owned by start_server: detach (stops its reader)
+        # but keep it open; only the PTY master is closed here
+        if self._serial_device is not None:
+            self._serial_device.release(self)
+        elif self._master_fd is not None:
             try:
-                self._loop.remove_reader(reader_fd)
+                os.close(self._master_fd)
+                logger.info("Closed master fd")
             except Exception:
-                logger.exception("Error removing reader for fd %s", reader_fd)
+                logger.exception("Error closing master fd")
+            self._master_fd = None
+
+    def eof_received(self):
+        self._close_device()
+        return True
+
+    def connection_lost(self, exc):
+        self._cancel_flush()
+        self._cancel_write()
+        self._close_device()
 
         if exc:
             logger.info("SSH session connection lost with error: %r", exc)
@@ -155,6 +541,29 @@ class PTYBridgeSession(asyncssh.SSHServerSession):
             logger.info("SSH session connection closed")
 
 
+class _ReadPipeProtocol(asyncio.Protocol):
+    """Feeds data read from the PTY master / serial port into its owner.
+
+    The owner is the PTYBridgeSession (PTY) or the SerialDevice (serial).
+    """
+
+    def __init__(self, owner):
+        self._owner = owner
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def data_received(self, data):
+        self._owner._buffer_output(data)
+
+    def eof_received(self):
+        logger.debug("EOF on read pipe for %r", self._owner)
+
+    def connection_lost(self, exc):
+        self._owner._on_read_closed(self._transport, exc)
+
+
 class SimpleSSHServer(asyncssh.SSHServer):
     def __init__(self, valid_user=None, valid_password=None, serial_path=None):
         self.valid_user = valid_user
@@ -163,6 +572,8 @@ class SimpleSSHServer(asyncssh.SSHServer):
 
     def connection_made(self, conn):
         logger.info("Incoming connection: %r", conn)
+        # asyncssh already sets TCP_NODELAY on the socket, and SO_SNDBUF is
+        # left alone so Linux keeps autotuning the send buffer
 
     def connection_lost(self, exc):
         logger.info("Connection lost: %r", exc)
@@ -191,92 +602,63 @@ class SimpleSSHServer(asyncssh.SSHServer):
 
 
 
-async def start_server(host='0.0.0.0', port=2222, host_key='host_key', user=None, password=None, serial_path=None, baudrate=115200):
+async def start_server(host='0.0.0.0', port=2222, host_key='host_key', user=None, password=None, serial_path=None, baudrate=115200, flush_delay=FLUSH_DELAY, reuse_port=False):
     server = SimpleSSHServer(valid_user=user, valid_password=password, serial_path=serial_path)
+    # Open the serial port once, before accepting connections, so a bad
+    # --serial path fails at startup rather than after each SSH handshake
+    serial_device = None
+    if serial_path:
+        serial_device = SerialDevice(serial_path, baudrate)
+        serial_device.open()
+
     async def session_factory(stdin, stdout, stderr):
         logger.debug("session_factory called with stdin=%s, stdout=%s, stderr=%s", type(stdin).__name__, type(stdout).__name__, type(stderr).__name__)
-        # If a serial_path specified, open that; else create a new PTY pair
-        serial_port = None
+        # Bridge the serial port opened at startup; else create a new PTY pair
         master_fd = None
-        if serial_path:
-            # Open serial port using PySerial
-            try:
-                serial_port = serial.Serial(
-                    port=serial_path,
-                    baudrate=baudrate,
-                    timeout=0,  # Non-blocking mode
-                    bytesize=serial.EIGHTBITS,
-                    parity=serial.PARITY_NONE,
-                    stopbits=serial.STOPBITS_ONE,
-                    xonxoff=False,  # Disable software flow control
-                    rtscts=False    # Disable hardware flow control
-                )
-                slave_name = serial_path
-                logger.info('Opened serial %s baud=%s (8N1, no flow control)', serial_path, baudrate)
-                logger.debug('Serial port settings: bytesize=%s, parity=%s, stopbits=%s, xonxoff=%s, rtscts=%s',
-                           serial_port.bytesize, serial_port.parity, serial_port.stopbits, 
-                           serial_port.xonxoff, serial_port.rtscts)
-            except Exception:
-                logger.exception('Could not open serial port %s', serial_path)
-                raise
+        if serial_device is not None:
+            slave_name = serial_device.path
         else:
             master_fd, slave_fd = os.openpty()
             slave_name = os.ttyname(slave_fd)
+            # Non-blocking so writes from the event loop never stall it
+            os.set_blocking(master_fd, False)
 
         logger.debug("session_factory: creating PTYBridgeSession")
-        loop = asyncio.get_event_loop()
-        session = PTYBridgeSession(master_fd, slave_name, serial_port=serial_port)
-        session._chan = stdout  # Use stdout as the channel for writing to SSH
-        session._loop = loop
-        
-        # Register reader for PTY/serial data
-        reader_fd = master_fd
-        if serial_port is not None:
-            try:
-                reader_fd = serial_port.fileno()
-                logger.debug("Got fileno() from serial_port: %s", reader_fd)
-            except Exception:
-                logger.exception("Failed to get fileno() from serial_port")
-                reader_fd = None
-        
-        if reader_fd is not None:
-            try:
-                loop.add_reader(reader_fd, session._on_master_readable)
-                logger.info("Registered reader for fd=%s", reader_fd)
-            except Exception:
-                logger.exception("Failed to add_reader for fd=%s", reader_fd)
-        
+        session = PTYBridgeSession(master_fd, slave_name, serial_device=serial_device, flush_delay=flush_delay)
+        if serial_device is not None and not serial_device.acquire(session):
+            logger.warning("Serial port %s is in use by another session; closing session", serial_device.path)
+            stdout.write(b"Serial port is busy, try again later\r\n")
+            # asyncssh doesn't close the channel when the handler returns
+            stdout.channel.exit(1)
+            return
+        # Use stdout as the channel for writing to SSH; this also registers
+        # the PTY/serial reader (exactly once)
+        session.connection_made(stdout)
+        if serial_device is not None and serial_device.fd is None:
+            # Device is being reopened after a disconnect; the session attaches
+            # as soon as it is back (SerialDevice notifies it)
+            logger.info("Serial port %s unavailable; session waiting for it", slave_name)
+            session._notify("waiting for serial device %s..." % slave_name)
+
         logger.info("Created PTY session, slave=%s", slave_name)
-        
+
         # Handle incoming data from SSH client
         try:
-            async for data in stdin:
-                logger.debug("Received from SSH: %d bytes, data=%r", len(data) if isinstance(data, (bytes, str)) else 0, 
-                           data[:30] if isinstance(data, (bytes, str)) else data)
+            # read(n) returns whatever is buffered (up to n bytes) instead of
+            # scanning for newlines like async iteration does
+            while not stdin.at_eof():
+                data = await stdin.read(READ_SIZE)
+                if not data:
+                    break
+                if session._debug:
+                    logger.debug("Received from SSH: %d bytes, data=%r", len(data), data[:30])
                 session.data_received(data, None)
         except Exception:
             logger.exception("Error in session handler")
         finally:
-            # Cleanup
-            if reader_fd is not None:
-                try:
-                    loop.remove_reader(reader_fd)
-                    logger.debug("Removed reader for fd=%s", reader_fd)
-                except Exception:
-                    logger.exception("Error removing reader")
-            
-            if serial_port is not None:
-                try:
-                    serial_port.close()
-                    logger.info("Closed serial port")
-                except Exception:
-                    logger.exception("Error closing serial port")
-            elif master_fd is not None:
-                try:
-                    os.close(master_fd)
-                    logger.info("Closed master fd")
-                except Exception:
-                    logger.exception("Error closing master fd")
+            # Cleanup: removes the reader, then closes the master fd (the
+            # serial port is released and stays open for the next session)
+            session.connection_lost(None)
 
     logger.info("Starting SSH server on %s:%s (host_key=%s)", host, port, host_key)
     await asyncssh.create_server(
@@ -285,4 +667,9 @@ async def start_server(host='0.0.0.0', port=2222, host_key='host_key', user=None
         port,
         server_host_keys=[host_key],
         session_factory=session_factory,
+        encoding=None,  # binary channel: stdin/stdout carry raw bytes
+        # --workers: every process binds the same port, the kernel balances
+        # (None keeps asyncio's defaults for a single process)
+        reuse_address=reuse_port or None,
+        reuse_port=reuse_port or None,
     )